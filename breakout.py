@@ -8,6 +8,8 @@ import numpy as np
 import plotly.graph_objects as go
 from scipy import stats
 
+from engine_adapter import LabelledBuffer
+
 
 df = pd.read_csv("EURUSD_Candlestick_1_D_BID_05.05.2003-28.10.2023.csv")
 
@@ -140,22 +142,13 @@ df['pattern_detected'] = df.apply(lambda row: detect_structure(row.name, backcan
 
 df[df['pattern_detected']!=0].head(20)
 
-data = df[:5000].copy()
-def SIGNAL():
-    return data.pattern_detected
-data.rename(columns={
-    'open': 'Open',
-    'high': 'High',
-    'low': 'Low',
-    'close': 'Close',
-    'volume': 'Volume'
-}, inplace=True)
-data
-
-data['RSI'] = ta.rsi(data['Close'])
-data.set_index("Gmt time", inplace=True)
-data.index = pd.to_datetime(data.index, format='%d.%m.%Y %H:%M:%S.%f').floor('S')
-data
+df['RSI'] = ta.rsi(df.close)
+# One copy and one date parse; backtesting.py gets views with its column names
+buffer = LabelledBuffer.from_frame(
+    df, time_column='Gmt time', time_format='%d.%m.%Y %H:%M:%S.%f',
+    columns=['open', 'high', 'low', 'close', 'volume', 'EMA', 'EMASignal',
+             'isPivot', 'pattern_detected', 'RSI'])
+data = buffer.for_backtesting(stop=5000)
 print(data)
 
 from backtesting import Strategy
@@ -165,7 +158,7 @@ class MyStrat(Strategy):
     mysize = 10000
     def init(self):
         super().init()
-        self.signal = self.I(SIGNAL)
+        self.signal = self.I(lambda: self.data.pattern_detected, name='SIGNAL')
 
     def next(self):
         super().next()
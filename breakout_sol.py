@@ -3,6 +3,8 @@ import numpy as np
 import plotly.graph_objects as go
 import vectorbt as vbt
 
+from engine_adapter import LabelledBuffer, breakout_signals
+
 
 class SOLUSDTBreakoutStrategy:
     def __init__(self, data, window_size=14):
@@ -11,6 +13,7 @@ class SOLUSDTBreakoutStrategy:
         self.supports = None
         self.resistances = None
         self.portfolio = None
+        self.buffer = None
 
     def detect_pivots(self):
         """
@@ -81,15 +84,19 @@ class SOLUSDTBreakoutStrategy:
         Backtest the strategy using support/resistance breakouts. Assumes transaction fees.
         Buy when price exceeds resistance, sell when price falls below support.
         """
-        # Entry signals: Close price breaking above resistance
-        entries = self.data['close'] > self.resistances.shift(1)
+        # Copy close and the pivot levels into one buffer; vectorbt gets views over it
+        self.buffer = LabelledBuffer.from_frame(
+            self.data.assign(resistances=self.resistances, supports=self.supports),
+            columns=['close', 'resistances', 'supports'],
+            bool_columns=['entries', 'exits'])
 
-        # Exit signals: Close price falling below support
-        exits = self.data['close'] < self.supports.shift(1)
+        # Entry: close breaking above resistance, exit: close falling below support
+        breakout_signals(self.buffer)
+        close, entries, exits = self.buffer.for_vectorbt()
 
         # Apply the backtest using vectorbt with frequency set to 1h
         self.portfolio = vbt.Portfolio.from_signals(
-            self.data['close'], entries, exits, fees=fee, freq='1h')
+            close, entries, exits, fees=fee, freq='1h')
         return self.portfolio, entries, exits
 
     def log_backtest_results(self):
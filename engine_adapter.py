@@ -0,0 +1,203 @@
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+
+# Column names backtesting.py expects for the price data
+BACKTESTING_COLUMNS = {
+    'open': 'Open',
+    'high': 'High',
+    'low': 'Low',
+    'close': 'Close',
+    'volume': 'Volume',
+}
+
+
+class LabelledBuffer:
+    """
+    Labelled OHLCV data and signal arrays held in one contiguous byte buffer.
+
+    The buffer is laid out as the int64 timestamps, then one float64 row per
+    price/label column, one int64 row per integer label column (isPivot,
+    pattern_detected, ...) and one bool row per signal column. Every column is a
+    contiguous 1-D view into it, and the frames handed to backtesting.py and
+    vectorbt are built over read-only views of them, so no engine handoff copies
+    data or re-parses dates and no engine can write through to the others.
+
+    Timestamps are stored as UTC nanoseconds. When filling the buffer by hand,
+    fill times first and then call build_index(); from_frame does both.
+    """
+
+    def __init__(self, length, float_columns, bool_columns=(), int_columns=()):
+        self.length = length
+        self.float_columns = list(float_columns)
+        self.int_columns = list(int_columns)
+        self.bool_columns = list(bool_columns)
+        # Column order for the handoff frames; from_frame keeps the source order
+        self.columns = self.float_columns + self.int_columns + self.bool_columns
+
+        times_bytes = length * 8
+        floats_bytes = len(self.float_columns) * length * 8
+        ints_bytes = len(self.int_columns) * length * 8
+        bools_bytes = len(self.bool_columns) * length
+        self.raw = np.zeros(times_bytes + floats_bytes + ints_bytes + bools_bytes,
+                            dtype=np.uint8)
+
+        self.times = np.ndarray((length,), dtype='M8[ns]', buffer=self.raw, offset=0)
+        self.floats = np.ndarray((len(self.float_columns), length), dtype=np.float64,
+                                 buffer=self.raw, offset=times_bytes)
+        self.ints = np.ndarray((len(self.int_columns), length), dtype=np.int64,
+                               buffer=self.raw, offset=times_bytes + floats_bytes)
+        self.bools = np.ndarray((len(self.bool_columns), length), dtype=np.bool_,
+                                buffer=self.raw,
+                                offset=times_bytes + floats_bytes + ints_bytes)
+        self.index = None
+
+    def build_index(self, tz=None, name=None):
+        """
+        Build the DatetimeIndex over the filled times, localised to tz if given.
+        """
+        dtype = 'M8[ns]' if tz is None else pd.DatetimeTZDtype('ns', tz)
+        # Integer epochs are read as UTC for a tz-aware dtype, without a copy
+        self.index = pd.DatetimeIndex(self.times.view('i8'), dtype=dtype, copy=False, name=name)
+        return self.index
+
+    @classmethod
+    def from_frame(cls, df, time_column=None, time_format=None, columns=None, bool_columns=()):
+        """
+        Copy a labelled frame into a new buffer. This is the only copy and the only
+        date parse; time_column is used as the index, otherwise df.index must
+        already be a DatetimeIndex. Integer columns keep int64 and bool columns
+        keep bool; other numeric columns become float64. bool_columns names extra
+        signal rows to allocate for filling in later.
+        """
+        if time_column is None and not isinstance(df.index, pd.DatetimeIndex):
+            raise ValueError("df needs a DatetimeIndex or a time_column to index by")
+        if columns is None:
+            columns = [col for col in df.columns
+                       if col != time_column and pd.api.types.is_numeric_dtype(df[col])]
+        bools = [col for col in columns if pd.api.types.is_bool_dtype(df[col])]
+        ints = [col for col in columns if col not in bools
+                and pd.api.types.is_integer_dtype(df[col])]
+        floats = [col for col in columns if col not in bools and col not in ints]
+        signals = [col for col in bool_columns if col not in bools]
+        buffer = cls(len(df), floats, bools + signals, ints)
+        buffer.columns = list(columns) + signals
+
+        if time_column is not None:
+            times = pd.to_datetime(df[time_column], format=time_format)
+            name = time_column
+        else:
+            times = df.index
+            name = df.index.name
+        # Tz-aware times convert to UTC here; build_index restores the timezone
+        buffer.times[:] = np.asarray(times, dtype='M8[ns]')
+        buffer.build_index(getattr(times.dtype, 'tz', None), name)
+        for row, col in enumerate(floats):
+            buffer.floats[row] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        for row, col in enumerate(ints):
+            buffer.ints[row] = df[col].to_numpy(dtype=np.int64)
+        for row, col in enumerate(bools):
+            buffer.bools[row] = df[col].to_numpy(dtype=np.bool_)
+        return buffer
+
+    def __len__(self):
+        return self.length
+
+    def column(self, name):
+        """
+        1-D view of a float, int or bool column.
+        """
+        if name in self.float_columns:
+            return self.floats[self.float_columns.index(name)]
+        if name in self.int_columns:
+            return self.ints[self.int_columns.index(name)]
+        if name in self.bool_columns:
+            return self.bools[self.bool_columns.index(name)]
+        raise KeyError(name)
+
+    def read_only(self, values):
+        """
+        Read-only view of part of the buffer for handing to an engine.
+        """
+        if self.index is None:
+            raise ValueError("index not built; fill times and call build_index() first")
+        values = values.view()
+        values.flags.writeable = False
+        return values
+
+    def for_backtesting(self, stop=None):
+        """
+        DataFrame for backtesting.py over the first stop rows, with OHLCV renamed
+        to Open/High/Low/Close/Volume and every label column alongside.
+        """
+        columns = {BACKTESTING_COLUMNS.get(col, col): self.read_only(self.column(col)[:stop])
+                   for col in self.columns}
+        return pd.DataFrame(columns, index=self.index[:stop], copy=False)
+
+    def series(self, name, stop=None):
+        """
+        Series view of one column on the buffer's datetime index.
+        """
+        return pd.Series(self.read_only(self.column(name)[:stop]), index=self.index[:stop],
+                         name=name, copy=False)
+
+    def for_vectorbt(self, close='close', entries='entries', exits='exits', stop=None):
+        """
+        (close, entries, exits) Series for vbt.Portfolio.from_signals.
+        """
+        return (self.series(close, stop),
+                self.series(entries, stop),
+                self.series(exits, stop))
+
+
+def breakout_signals(buffer, resistance='resistances', support='supports',
+                     close='close', entries='entries', exits='exits'):
+    """
+    Write the breakout_sol.py signals straight into the buffer's bool rows:
+    entry when close breaks the previous bar's resistance, exit when it breaks
+    the previous bar's support. Replaces the .shift(1) Series comparisons.
+    """
+    close = buffer.column(close)
+    entries = buffer.column(entries)
+    exits = buffer.column(exits)
+    entries[:1] = exits[:1] = False
+    np.greater(close[1:], buffer.column(resistance)[:-1], out=entries[1:])
+    np.less(close[1:], buffer.column(support)[:-1], out=exits[1:])
+    return entries, exits
+
+
+def measure_handoff(handoff, *args, **kwargs):
+    """
+    Run handoff(*args, **kwargs) and return (result, seconds, peak bytes allocated).
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = handoff(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+if __name__ == '__main__':
+    data = pd.read_csv('sol_usdt_5y_kline_data.csv')
+    data['resistances'] = data['high'].rolling(window=14).max().bfill()
+    data['supports'] = data['low'].rolling(window=14).min().bfill()
+
+    buffer = LabelledBuffer.from_frame(
+        data, time_column='Gmt time',
+        columns=['open', 'high', 'low', 'close', 'volume', 'resistances', 'supports'],
+        bool_columns=['entries', 'exits'])
+    breakout_signals(buffer)
+
+    for length in (1000, 5000, 20000, len(buffer)):
+        bt_data, bt_time, bt_peak = measure_handoff(buffer.for_backtesting, stop=length)
+        _, vbt_time, vbt_peak = measure_handoff(buffer.for_vectorbt, stop=length)
+        shared = np.shares_memory(bt_data['Close'].to_numpy(), buffer.raw)
+        print(f"{length:>6} bars: backtesting.py {bt_time * 1e3:.3f} ms / {bt_peak} B, "
+              f"vectorbt {vbt_time * 1e3:.3f} ms / {vbt_peak} B, shared={shared}")
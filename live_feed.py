@@ -0,0 +1,281 @@
+import asyncio
+import csv
+import json
+import time
+from collections import deque
+
+
+class BreakoutDetector:
+    def __init__(self, window_size=14):
+        self.window_size = window_size
+        self.highs = deque(maxlen=window_size)
+        self.lows = deque(maxlen=window_size)
+
+    def update(self, bar):
+        """
+        Feed one closed bar and return 'buy', 'sell' or None.
+        Same rule as SOLUSDTBreakoutStrategy.backtest: close above the previous
+        rolling high is an entry, close below the previous rolling low is an exit.
+        """
+        signal = None
+        if len(self.highs) == self.window_size:
+            if bar['close'] > max(self.highs):
+                signal = 'buy'
+            elif bar['close'] < min(self.lows):
+                signal = 'sell'
+        self.highs.append(bar['high'])
+        self.lows.append(bar['low'])
+        return signal
+
+
+class ReplayServer:
+    """
+    Local stand-in for the exchange kline stream. Clients connect, send
+    'SUBSCRIBE <symbol>' and receive one JSON line per closed bar.
+    """
+
+    def __init__(self, csv_path, symbols, bars_per_second=None,
+                 host='127.0.0.1', port=0):
+        self.csv_path = csv_path
+        self.symbols = symbols
+        # None replays as fast as the client reads
+        self.bars_per_second = bars_per_second
+        self.host = host
+        self.port = port
+        self.bars = None
+        self.server = None
+
+    def load(self):
+        """
+        Read the CSV once and pre-encode every bar as the tail of its JSON line, so
+        replay only prepends the symbol and writes to the socket.
+        """
+        bars = []
+        with open(self.csv_path, newline='') as f:
+            for row in csv.DictReader(f):
+                bar = {'time': row['Gmt time'],
+                       'open': float(row['open']),
+                       'high': float(row['high']),
+                       'low': float(row['low']),
+                       'close': float(row['close']),
+                       'volume': float(row['volume']),
+                       'closed': True}
+                # Drop the opening brace; handle() prepends it with the symbol field
+                bars.append(json.dumps(bar).encode()[1:] + b'\n')
+        self.bars = bars
+        return bars
+
+    async def start(self):
+        if self.bars is None:
+            self.load()
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        try:
+            request = (await reader.readline()).decode().split()
+            if len(request) != 2 or request[0] != 'SUBSCRIBE' or request[1] not in self.symbols:
+                writer.write(b'ERROR unknown subscription\n')
+                await writer.drain()
+                return
+
+            prefix = ('{"symbol": %s, ' % json.dumps(request[1])).encode()
+            start = time.perf_counter()
+            for n, bar in enumerate(self.bars):
+                writer.write(prefix + bar)
+                if self.bars_per_second:
+                    # Sleep only when ahead of schedule so the rate holds at thousands of bars/s
+                    delay = start + (n + 1) / self.bars_per_second - time.perf_counter()
+                    if delay > 0:
+                        await writer.drain()
+                        await asyncio.sleep(delay)
+                # drain() blocks when the client stops reading, which is where backpressure lands
+                await writer.drain()
+            writer.write(b'END\n')
+            await writer.drain()
+        except (ConnectionResetError, BrokenPipeError):
+            # Client went away mid-stream; nothing left to send it
+            pass
+        finally:
+            writer.close()
+
+
+class LiveFeed:
+    """
+    Subscribes to one bar stream per symbol and runs a breakout detector on each.
+    Every symbol gets its own bounded bar queue so a slow detector stalls only
+    its own socket reader. Signals from all pairs share one bounded queue, so a
+    consumer that stops draining self.signals stalls every pair.
+    """
+
+    def __init__(self, host, port, symbols, window_size=14, queue_size=1000):
+        self.host = host
+        self.port = port
+        self.symbols = symbols
+        self.window_size = window_size
+        self.queue_size = queue_size
+        self.signals = asyncio.Queue(maxsize=queue_size)
+        # Per-bar timings in seconds: latencies run from socket read to signal and
+        # include queue_waits (time spent in the bounded bar queue, i.e. backpressure)
+        # as well as detect_times (the detector itself)
+        self.latencies = {symbol: [] for symbol in symbols}
+        self.queue_waits = {symbol: [] for symbol in symbols}
+        self.detect_times = {symbol: [] for symbol in symbols}
+        self.bar_counts = {symbol: 0 for symbol in symbols}
+
+    async def subscribe(self, symbol, queue):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        writer.write(f'SUBSCRIBE {symbol}\n'.encode())
+        await writer.drain()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line or line == b'END\n':
+                    break
+                if line.startswith(b'ERROR'):
+                    raise ConnectionError(line.decode().strip())
+                received = time.perf_counter()
+                bar = json.loads(line)
+                if not bar.get('closed'):
+                    continue
+                # put() waits while the queue is full, which stops us reading the socket
+                await queue.put((bar, received))
+            await queue.put(None)
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    async def detect(self, symbol, queue):
+        """
+        Run the detector over the symbol's bar queue. A signal's latency is
+        socket-to-signal time, so it includes any wait in the bar queue.
+        """
+        detector = BreakoutDetector(self.window_size)
+        latencies = self.latencies[symbol]
+        queue_waits = self.queue_waits[symbol]
+        detect_times = self.detect_times[symbol]
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            bar, received = item
+            dequeued = time.perf_counter()
+            signal = detector.update(bar)
+            done = time.perf_counter()
+            latency = done - received
+            latencies.append(latency)
+            queue_waits.append(dequeued - received)
+            detect_times.append(done - dequeued)
+            self.bar_counts[symbol] += 1
+            if signal is not None:
+                await self.signals.put({'symbol': symbol,
+                                        'time': bar['time'],
+                                        'signal': signal,
+                                        'close': bar['close'],
+                                        'latency': latency})
+
+    async def run(self):
+        """
+        Run all subscriptions to completion. Signals are pushed onto self.signals
+        and a None is pushed once every stream has ended.
+        """
+        tasks = []
+        for symbol in self.symbols:
+            queue = asyncio.Queue(maxsize=self.queue_size)
+            tasks.append(asyncio.create_task(self.subscribe(symbol, queue)))
+            tasks.append(asyncio.create_task(self.detect(symbol, queue)))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.end_signals()
+
+    def end_signals(self):
+        """
+        Push the end marker without blocking, dropping the oldest signal if the queue is full.
+        """
+        try:
+            self.signals.put_nowait(None)
+        except asyncio.QueueFull:
+            self.signals.get_nowait()
+            self.signals.put_nowait(None)
+
+    def latency_summary(self):
+        """
+        Per-symbol bar count and p50/p99/max in milliseconds for three timings:
+        latency is socket-to-signal time including backpressure, queue_wait is the
+        part spent in the bounded bar queue and detect is the detector alone.
+        """
+        summary = {}
+        for symbol, latencies in self.latencies.items():
+            if not latencies:
+                continue
+            summary[symbol] = {
+                'bars': self.bar_counts[symbol],
+                'latency': percentiles(latencies),
+                'queue_wait': percentiles(self.queue_waits[symbol]),
+                'detect': percentiles(self.detect_times[symbol]),
+            }
+        return summary
+
+
+def percentiles(values):
+    """
+    p50, p99 and max of a list of seconds, in milliseconds.
+    """
+    ordered = sorted(values)
+    return {
+        'p50_ms': ordered[len(ordered) // 2] * 1000,
+        'p99_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000,
+        'max_ms': ordered[-1] * 1000,
+    }
+
+
+async def replay(csv_path, symbols, bars_per_second=None, queue_size=1000, window_size=14):
+    """
+    Serve csv_path for every symbol through a local ReplayServer and run LiveFeed against it.
+    Returns the signals, the latency summary and the overall throughput in bars per second.
+    """
+    server = ReplayServer(csv_path, symbols, bars_per_second=bars_per_second)
+    await server.start()
+    feed = LiveFeed(server.host, server.port, symbols,
+                    window_size=window_size, queue_size=queue_size)
+    signals = []
+
+    async def collect():
+        while True:
+            signal = await feed.signals.get()
+            if signal is None:
+                break
+            signals.append(signal)
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(feed.run(), collect())
+    finally:
+        await server.stop()
+    elapsed = time.perf_counter() - start
+    throughput = sum(feed.bar_counts.values()) / elapsed
+    return signals, feed.latency_summary(), throughput
+
+
+if __name__ == '__main__':
+    symbols = ['SOLUSDT', 'SOLUSDT_B', 'SOLUSDT_C', 'SOLUSDT_D']
+    signals, summary, throughput = asyncio.run(
+        replay('sol_usdt_5y_kline_data.csv', symbols, bars_per_second=5000))
+
+    print(f"Signals emitted: {len(signals)}")
+    for symbol, stats in summary.items():
+        print(f"{symbol}: {stats['bars']} bars")
+        for name in ('latency', 'queue_wait', 'detect'):
+            timing = stats[name]
+            print(f"  {name:<10} p50 {timing['p50_ms']:.3f} ms, "
+                  f"p99 {timing['p99_ms']:.3f} ms, max {timing['max_ms']:.3f} ms")
+    print(f"Throughput: {throughput:.0f} bars/s")
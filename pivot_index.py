@@ -0,0 +1,193 @@
+import bisect
+import csv
+import math
+import time
+
+
+PIVOT_HIGH = 1
+PIVOT_LOW = 2
+PIVOT_BOTH = 3
+
+
+class PivotIndex:
+    """
+    Persistent index of confirmed pivot levels, bucketed by price.
+
+    Each bucket covers bucket_width of price and keeps its pivots sorted by bar,
+    so a zone query only touches the few buckets overlapping the zone and
+    bisects each one for the lookback cut-off. Pivots are also kept per kind in
+    bar order so the most recent highs or lows can be sliced off directly.
+    """
+
+    def __init__(self, bucket_width):
+        if bucket_width <= 0:
+            raise ValueError("bucket_width must be positive")
+        self.bucket_width = bucket_width
+        self.buckets = {}
+        self.by_kind = {PIVOT_HIGH: ([], []), PIVOT_LOW: ([], []), PIVOT_BOTH: ([], [])}
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def bucket_key(self, price):
+        return math.floor(price / self.bucket_width)
+
+    def add(self, bar, price, kind, timestamp=None):
+        """
+        Add a confirmed pivot. kind follows isPivot in breakout.py: 1 high, 2 low,
+        3 for either level of a bar that is both.
+        Pivots normally arrive in bar order and are appended; late ones are inserted.
+        """
+        level = (bar, price, kind, timestamp)
+        for bars, levels in (self.buckets.setdefault(self.bucket_key(price), ([], [])),
+                             self.by_kind[kind]):
+            if bars and bar < bars[-1]:
+                pos = bisect.bisect_right(bars, bar)
+            else:
+                pos = len(bars)
+            bars.insert(pos, bar)
+            levels.insert(pos, level)
+        self.size += 1
+
+    def query(self, price, zone_width, current_bar=None, lookback=None, kind=None):
+        """
+        All pivots within zone_width of price formed in the last lookback bars
+        before current_bar, as (bar, price, kind, timestamp) tuples in bar order.
+        lookback needs current_bar.
+        """
+        start_bar = None
+        if lookback is not None:
+            if current_bar is None:
+                raise ValueError("lookback requires current_bar")
+            start_bar = current_bar - lookback
+        low, high = price - zone_width, price + zone_width
+
+        found = []
+        for key in range(self.bucket_key(low), self.bucket_key(high) + 1):
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                continue
+            bars, levels = bucket
+            first = 0 if start_bar is None else bisect.bisect_left(bars, start_bar)
+            last = len(bars) if current_bar is None else bisect.bisect_left(bars, current_bar)
+            for level in levels[first:last]:
+                if low <= level[1] <= high and (kind is None or level[2] == kind):
+                    found.append(level)
+        if len(found) > 1:
+            found.sort()
+        return found
+
+    def touches(self, price, zone_width, current_bar=None, lookback=None, kind=None):
+        """
+        Number of pivots that touched the zone around price.
+        """
+        return len(self.query(price, zone_width, current_bar, lookback, kind))
+
+    def zone(self, price, zone_width, current_bar=None, lookback=None, kind=None, min_touches=3):
+        """
+        Mean level of the pivots clustered around price, or None with fewer than min_touches.
+        """
+        levels = self.query(price, zone_width, current_bar, lookback, kind)
+        if len(levels) < min_touches:
+            return None
+        return sum(level[1] for level in levels) / len(levels)
+
+    def recent(self, kind, current_bar, lookback=None, count=3):
+        """
+        The last count pivots of kind formed before current_bar, and no earlier
+        than lookback bars before it, in bar order.
+        """
+        bars, levels = self.by_kind[kind]
+        last = bisect.bisect_left(bars, current_bar)
+        first = 0 if lookback is None else bisect.bisect_left(bars, current_bar - lookback)
+        return levels[max(first, last - count):last]
+
+    def level_break(self, close, zone_width, current_bar, lookback=None, min_touches=3):
+        """
+        Same check as detect_structure in breakout.py: the last min_touches pivot
+        lows (highs) in the lookback form a zone if each sits within zone_width of
+        their mean. Like detect_structure, bars that are both a pivot high and a
+        pivot low (kind 3) are left out of both zones. Returns 1 if close is more than 2*zone_width below the support
+        zone, 2 if more than 2*zone_width above the resistance zone, 0 otherwise.
+        """
+        levelbreak = 0
+        support = self.cluster(PIVOT_LOW, zone_width, current_bar, lookback, min_touches)
+        if support is not None and (support - close) > zone_width * 2:
+            levelbreak = 1
+        resistance = self.cluster(PIVOT_HIGH, zone_width, current_bar, lookback, min_touches)
+        if resistance is not None and (close - resistance) > zone_width * 2:
+            levelbreak = 2
+        return levelbreak
+
+    def cluster(self, kind, zone_width, current_bar, lookback=None, min_touches=3):
+        """
+        Mean of the last min_touches pivots of kind if they all lie within
+        zone_width of it, otherwise None.
+        """
+        levels = self.recent(kind, current_bar, lookback, min_touches)
+        if len(levels) < min_touches:
+            return None
+        mean = sum(level[1] for level in levels) / len(levels)
+        if any(abs(level[1] - mean) > zone_width for level in levels):
+            return None
+        return mean
+
+    @classmethod
+    def from_pivots(cls, is_pivot, highs, lows, bucket_width, timestamps=None):
+        """
+        Build an index from an isPivot column (1 high, 2 low, 3 both) and its highs/lows.
+        A bar flagged 3 adds its high and its low under PIVOT_BOTH, so zone queries
+        still see both levels but level_break ignores them.
+        """
+        index = cls(bucket_width)
+        for bar, flag in enumerate(is_pivot):
+            timestamp = None if timestamps is None else timestamps[bar]
+            if flag == PIVOT_HIGH:
+                index.add(bar, highs[bar], PIVOT_HIGH, timestamp)
+            elif flag == PIVOT_LOW:
+                index.add(bar, lows[bar], PIVOT_LOW, timestamp)
+            elif flag == PIVOT_BOTH:
+                index.add(bar, highs[bar], PIVOT_BOTH, timestamp)
+                index.add(bar, lows[bar], PIVOT_BOTH, timestamp)
+        return index
+
+
+def is_pivot(highs, lows, window):
+    """
+    Same rule as isPivot in breakout.py over plain lists:
+    1 if pivot high, 2 if pivot low, 3 if both and 0 default.
+    """
+    n = len(highs)
+    flags = [0] * n
+    for candle in range(window, n - window):
+        span = range(candle - window, candle + window + 1)
+        pivot_high = all(highs[candle] >= highs[i] for i in span)
+        pivot_low = all(lows[candle] <= lows[i] for i in span)
+        flags[candle] = (PIVOT_HIGH if pivot_high else 0) | (PIVOT_LOW if pivot_low else 0)
+    return flags
+
+
+if __name__ == '__main__':
+    with open('sol_usdt_5y_kline_data.csv', newline='') as f:
+        rows = list(csv.DictReader(f))
+    times = [row['Gmt time'] for row in rows]
+    highs = [float(row['high']) for row in rows]
+    lows = [float(row['low']) for row in rows]
+    closes = [float(row['close']) for row in rows]
+
+    window = 6
+    zone_width = 0.5
+    index = PivotIndex.from_pivots(is_pivot(highs, lows, window), highs, lows,
+                                   bucket_width=zone_width, timestamps=times)
+    print(f"Pivots indexed: {len(index)}")
+
+    start = time.perf_counter()
+    breaks = [0] * len(closes)
+    for candle in range(len(closes)):
+        # Only pivots confirmed window bars ago are visible to avoid look ahead bias
+        breaks[candle] = index.level_break(closes[candle], zone_width,
+                                           current_bar=candle - window, lookback=500)
+    elapsed = time.perf_counter() - start
+    print(f"Level breaks: {sum(1 for b in breaks if b)} in {elapsed:.3f}s "
+          f"({elapsed / len(closes) * 1e6:.1f} us per bar)")